@@ -1,14 +1,21 @@
 import os
+import functools
 import dotenv
 import pandas as pd
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple
 
 
 __all__ = ["load_config", "load_data", "save_png"]
 
 
+# Images are processed concurrently in Python thread pools, so OpenCV's own thread pool would oversubscribe the cores. 
+cv2.setNumThreads(0)
+
+
+@functools.lru_cache(maxsize=1)
 def load_config() -> Tuple[str, str, str, str]:
     """
     Loads environment variables from a `.env` file and returns directory paths for various project components.
@@ -36,6 +43,7 @@ def load_config() -> Tuple[str, str, str, str]:
     `JP2_COMPRESSED_DIR`, and `SVD_COMPRESSED_DIR` in the `.env` file. If these environment variables are not set,
     an exception will be raised. The function uses the `os.environ` to access the environment variables and 
     constructs paths based on the `PROJECT_DIR` base directory.
+    The result is cached, so the `.env` file is only parsed once per process.
     """
     dotenv.load_dotenv()
 
@@ -47,6 +55,25 @@ def load_config() -> Tuple[str, str, str, str]:
     return PROJECT_DIR, RAW_DATA_DIR, JP2_COMPRESSED_DIR, SVD_COMPRESSED_DIR
 
 
+def _load_image(entry: os.DirEntry) -> Tuple[str, int, np.ndarray]:
+    """
+    Reads a single image file and converts it to RGB format.
+
+    Parameters
+    ----------
+    entry : os.DirEntry
+        The directory entry of the image file.
+
+    Returns
+    -------
+    Tuple[str, int, np.ndarray]
+        A tuple containing the name of the image file, its size in bytes, and the image in RGB format.
+    """
+    # Reversing the channel axis swaps BGR to RGB; the copy makes the array contiguous again. 
+    img = np.ascontiguousarray(cv2.imread(entry.path)[:, :, ::-1])
+    return entry.name, entry.stat().st_size, img
+
+
 def load_data() -> Tuple[List[np.ndarray], pd.DataFrame]:
     """
     Loads image data from PROJECT_DIR/image_data/raw_data, and returns a list of images and a DataFrame with metadata.
@@ -73,26 +100,28 @@ def load_data() -> Tuple[List[np.ndarray], pd.DataFrame]:
     -----
     The images are loaded from a directory path specified by `RAW_DATA_DIR`, which is determined by 
     the `load_config()` function. The images are read using OpenCV, converted from BGR to RGB, and stored in a list.
+    The images are read concurrently using a thread pool, and are returned in sorted order of their filenames.
     """
     _, RAW_DATA_DIR, _, _ = load_config()
-    df = pd.DataFrame(
-        columns=["img_name", "raw_img_size_in_bytes", "img_shape"], 
-        dtype=object
-    ).sort_values(by="img_name").reset_index(drop=True)
 
-    imgs = []
+    # DirEntry caches the stat result, which avoids a separate `os.path.getsize` call per file. 
+    with os.scandir(RAW_DATA_DIR) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
 
-    for idx, img_name in enumerate(sorted(os.listdir(RAW_DATA_DIR))):
-        img_path = os.path.join(
-            RAW_DATA_DIR, img_name
-        )
+    # Decoding releases the GIL, so the images can be read concurrently. `map` preserves the sorted order. 
+    with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as pool:
+        results = list(pool.map(_load_image, entries))
 
-        img = cv2.cvtColor(cv2.imread(img_path), cv2.COLOR_BGR2RGB)
-        imgs.append(img)
+    names = [name for name, _, _ in results]
+    sizes = [size for _, size, _ in results]
+    imgs = [img for _, _, img in results]
+    shapes = [img.shape for img in imgs]
 
-        df.at[idx, "img_name"] = img_name
-        df.at[idx, "raw_img_size_in_bytes"] = os.path.getsize(img_path) 
-        df.at[idx, "img_shape"] = img.shape
+    df = pd.DataFrame({
+        "img_name": names, 
+        "raw_img_size_in_bytes": np.asarray(sizes, dtype=np.int64), 
+        "img_shape": shapes
+    })
 
     return imgs, df
 
@@ -102,7 +131,7 @@ def save_png(image: np.ndarray, path: str) -> None:
     Saves a given image array as a PNG file at the specified path.
 
     This function takes a numpy array representing an image in RGB format, converts it to BGR format 
-    (as required by OpenCV for saving), and saves it as a PNG file at the specified path.
+    (as required by OpenCV for saving) by reversing the channel axis, and saves it as a PNG file at the specified path.
 
     Parameters
     ----------
@@ -121,4 +150,5 @@ def save_png(image: np.ndarray, path: str) -> None:
     The function uses OpenCV's `cv2.imwrite` method to save the image. Ensure that the provided path includes 
     the `.png` extension for proper saving.
     """
-    cv2.imwrite(path, cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
\ No newline at end of file
+    cv2.imwrite(path, image[:, :, ::-1])
+
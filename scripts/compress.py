@@ -2,10 +2,12 @@ import os
 import numpy as np
 import pandas as pd
 import glymur
-from scripts.svd import compress_image_using_svd
-from scripts.metrics import calculate_metrics
+from scripts.svd import precompute_svd, reconstruct_from_svd
+from scripts.metrics import calculate_metrics_from_arrays
 from scripts.common import load_config, save_png
-from typing import List, Sequence, Literal, Union, Dict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Any, List, Sequence, Literal, Union, Dict, Tuple
 
 
 PROJECT_DIR, RAW_DATA_DIR, JP2_COMPRESSED_DIR, SVD_COMPRESSED_DIR = load_config()
@@ -14,6 +16,63 @@ PROJECT_DIR, RAW_DATA_DIR, JP2_COMPRESSED_DIR, SVD_COMPRESSED_DIR = load_config(
 __all__ = ["compress_images"]
 
 
+def _process_one(
+        original_img: np.ndarray, 
+        img_name: str, 
+        original_size: int, 
+        param: Union[int, float], 
+        method: Literal["jp2", "svd"], 
+        image_svd: Dict[str, Any] | None = None
+) -> Tuple[str, np.ndarray, Dict[str, float]]:
+    """
+    Compress a single image with the given method and parameter, and calculate its metrics.
+
+    Parameters
+    ----------
+    original_img : np.ndarray
+        The image to compress, represented as a numpy array in RGB format.
+    img_name : str
+        The filename of the original image in `RAW_DATA_DIR`.
+    original_size : int
+        The size of the original image file in bytes.
+    param : Union[int, float]
+        The compression parameter. For SVD, this is the explained variance; for JP2, the compression ratio.
+    method : Literal["jp2", "svd"]
+        The compression method to use.
+    image_svd : dict, optional
+        The SVD of `original_img`, as returned by `precompute_svd`. Required if `method` is "svd".
+
+    Returns
+    -------
+    Tuple[str, np.ndarray, Dict[str, float]]
+        A tuple containing the filename of the compressed image, the compressed image and its metrics.
+
+    Notes
+    -----
+    - The compressed image is saved to `SVD_COMPRESSED_DIR` or `JP2_COMPRESSED_DIR`, depending on `method`.
+    - Each call is independent of the others, which allows `compress_images` to run them concurrently.
+    """
+    if method == "svd":
+        name = f"{img_name[:-4]}_expvar{param}.png"
+        compressed_img_path = os.path.join(SVD_COMPRESSED_DIR, name)
+        compressed_img, metadata = reconstruct_from_svd(image_svd, explained_variance=param)
+        # The PNG is encoded in this worker, so the encodes run as concurrently as the images themselves. 
+        save_png(compressed_img, compressed_img_path)
+    else:
+        name = f"{img_name[:-4]}_cratio{param}.jp2"
+        compressed_img_path = os.path.join(JP2_COMPRESSED_DIR, name)
+        # Decode once through the handle returned by the encoder; the array is used for both the output and the metrics. 
+        jp2 = glymur.Jp2k(compressed_img_path, original_img, cratios=[param])
+        compressed_img = jp2[:]
+
+    # Both images are already in memory, so only the size of the compressed file is read from disk. 
+    metrics = calculate_metrics_from_arrays(
+        original_img, compressed_img, original_size, os.path.getsize(compressed_img_path)
+    )
+
+    return name, compressed_img, metrics
+
+
 def compress_images(
         images: List[np.ndarray], 
         image_names: Sequence[str], 
@@ -56,10 +115,13 @@ def compress_images(
     Notes
     -----
     - The function supports two compression methods: "svd" and "jp2".
-        - For "svd", the compression is done using Singular Value Decomposition with the specified explained variance parameter.
+        - For "svd", the compression is done using Singular Value Decomposition with the specified explained variance parameter. 
+          The SVD of each image is computed once, and reused for every parameter in `param_set`.
         - For "jp2", the compression is done using JPEG2000 with the specified compression ratio parameter.
     - If `num_images` is `None`, all the images will be processed.
     - The metrics for each image are calculated and stored in a pandas DataFrame.
+    - The images are compressed concurrently using a thread pool; the results are kept in the order of `images`. 
+      The channels of each image are decomposed sequentially, unless there are enough workers for every channel.
     - The compressed images are saved to disk in the corresponding directories (`SVD_COMPRESSED_DIR` or `JP2_COMPRESSED_DIR`).
     """
     if not num_images:
@@ -70,36 +132,53 @@ def compress_images(
 
     data = dict()
 
-    for param in param_set:
-        # Used for creating the metrics dataframe
-        img_names_list = []
-        compressed_imgs = []
-        metrics_df = pd.DataFrame()
-
-        for original_img, img_name in zip(images[:num_images], image_names[:num_images]):
-            original_img_path = os.path.join(RAW_DATA_DIR, img_name)
-            if method == "svd":
-                name = f"{img_name[:-4]}_expvar{param}.png"
-                compressed_img_path = os.path.join(SVD_COMPRESSED_DIR, name)
-                compressed_img, metadata = compress_image_using_svd(original_img, explained_variance=param)
-                save_png(compressed_img, compressed_img_path)
-            else:
-                name = f"{img_name[:-4]}_cratio{param}.jp2"
-                compressed_img_path = os.path.join(JP2_COMPRESSED_DIR, name)
-                glymur.Jp2k(compressed_img_path, original_img, cratios=[param])
-                compressed_img = glymur.Jp2k(compressed_img_path)[:]
-
-            compressed_imgs.append(compressed_img)
-            img_names_list.append(name)
-
-            metrics = pd.DataFrame([calculate_metrics(original_img_path, compressed_img_path)])
-            metrics_df = pd.concat([metrics_df, metrics], axis=0).reset_index(drop=True)
-
-        metrics_df.insert(0, "img_name", img_names_list)
-
-        data[param] = dict(
-            compressed_images=compressed_imgs, 
-            metrics=metrics_df 
-        )
+    images = images[:num_images]
+    image_names = image_names[:num_images]
+
+    # The originals are the same for every parameter, so their sizes are only read once. 
+    original_sizes = [os.path.getsize(os.path.join(RAW_DATA_DIR, img_name)) for img_name in image_names]
+
+    # The images are independent of each other, and the heavy lifting (LAPACK, OpenJPEG, libpng) releases the GIL. 
+    max_workers = min(32, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # The SVD of an image does not depend on the explained variance, so it is computed once per image, 
+        # with enough components for the largest explained variance, and truncated for each parameter. 
+        # The channels of each image are only decomposed in their own threads if there is a worker for every 
+        # channel of every image, so that the per-channel pools do not oversubscribe the cores. 
+        if method == "svd" and param_set:
+            parallel_channels = len(images) * 3 <= max_workers
+            image_svds = list(pool.map(
+                precompute_svd, 
+                images, 
+                repeat(max(param_set)), 
+                repeat(None), 
+                repeat(None), 
+                repeat(parallel_channels)
+            ))
+        else:
+            image_svds = [None] * len(images)
+
+        for param in param_set:
+            futures = [
+                pool.submit(_process_one, original_img, img_name, original_size, param, method, image_svd) 
+                for original_img, img_name, original_size, image_svd in zip(images, image_names, original_sizes, image_svds)
+            ]
+            # Collect the results in submission order, so that the rows line up with `images`.
+            results = [future.result() for future in futures]
+
+            # Used for creating the metrics dataframe
+            img_names_list = [name for name, _, _ in results]
+            compressed_imgs = [compressed_img for _, compressed_img, _ in results]
+            metric_rows = [metrics for _, _, metrics in results]
+
+            # Build the dataframe once, instead of concatenating a row per image. 
+            metrics_df = pd.DataFrame(metric_rows)
+
+            metrics_df.insert(0, "img_name", img_names_list)
+
+            data[param] = dict(
+                compressed_images=compressed_imgs, 
+                metrics=metrics_df 
+            )
 
     return data
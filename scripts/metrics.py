@@ -1,26 +1,203 @@
 import os
-import dotenv
+import functools
 import numpy as np
 import pandas as pd
 import cv2
 import glymur
-from skimage.metrics import structural_similarity as ssim, peak_signal_noise_ratio as psnr
+from skimage.metrics import structural_similarity as ssim
 from typing import Dict, List, Union, Literal
 from scripts.common import load_config
 
 
-dotenv.load_dotenv()
-
 PROJECT_DIR, _, _, _ = load_config()
 
 SVD_METRICS_DIR = os.path.join(PROJECT_DIR, os.environ["SVD_METRICS_DIR"])
 JP2_METRICS_DIR = os.path.join(PROJECT_DIR, os.environ["JP2_METRICS_DIR"])
 
 
-__all__ = ["calculate_metrics", "save_metrics"]
+__all__ = ["calculate_metrics", "calculate_metrics_from_arrays", "save_metrics"]
+
+
+def _decode_png(path: str) -> np.ndarray:
+    """
+    Read a PNG file in RGB format.
+
+    Parameters
+    ----------
+    path : str
+        The file path of the image.
+
+    Returns
+    -------
+    np.ndarray
+        The image in RGB format.
+    """
+    # Reversing the channel axis converts OpenCV's BGR to RGB. 
+    return np.ascontiguousarray(cv2.imread(path)[:, :, ::-1])
+
+
+@functools.lru_cache(maxsize=64)
+def _read_png(path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """
+    Read a PNG file in RGB format, caching the result.
+
+    Parameters
+    ----------
+    path : str
+        The file path of the image.
+    mtime_ns : int
+        The modification time of the file in nanoseconds. Only used as part of the cache key.
+    size : int
+        The size of the file in bytes. Only used as part of the cache key.
+
+    Returns
+    -------
+    np.ndarray
+        The image in RGB format. The array is read-only, since it is shared between callers.
+    """
+    image = _decode_png(path)
+    image.flags.writeable = False
+    return image
+
+
+def _load_png(path: str) -> np.ndarray:
+    """
+    Load a PNG file in RGB format, reusing the decoded image if the file has not changed since it was last read.
+
+    Parameters
+    ----------
+    path : str
+        The file path of the image.
+
+    Returns
+    -------
+    np.ndarray
+        The image in RGB format (read-only).
+
+    Notes
+    -----
+    - The cache is keyed on the path, modification time and size of the file, so a file that is overwritten 
+      (e.g. by a new compression run) is decoded again.
+    """
+    stat = os.stat(path)
+    return _read_png(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _get_luminance(image: np.ndarray) -> np.ndarray:
+    """
+    Convert an RGB image to its luminance (Y) channel, using the Rec. 709 coefficients.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        The image in RGB format (height, width, 3).
+
+    Returns
+    -------
+    np.ndarray
+        A 2D array (height, width) of `np.float32` luminance values in the range [0, 255].
+    """
+    return image.astype(np.float32) @ np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+def _calculate_image_quality(original_image: np.ndarray, compressed_image: np.ndarray, fast: bool = False) -> Dict[str, float]:
+    """
+    Calculate the image quality metrics between the original and compressed images, given as arrays.
+
+    This function computes the metrics that depend only on the pixels, and not on the compressed file:
+    - Peak Signal-to-Noise Ratio (PSNR)
+    - Structural Similarity Index (SSIM)
+
+    Parameters
+    ----------
+    original_image : np.ndarray
+        The original image in RGB format.
+    compressed_image : np.ndarray
+        The compressed image in RGB format.
+    fast : bool, optional
+        If True, SSIM is computed on the luminance channel only, instead of on all three channels. Defaults to False.
+
+    Returns
+    -------
+    dict
+        A dictionary containing the following keys:
+        - `peak_signal_noise_ratio`: The PSNR value between the original and compressed images.
+        - `structural_similarity`: The SSIM value between the original and compressed images.
+
+    Notes
+    -----
+    - The images are expected to be 8-bit, so the data range of 255 is used for both PSNR and SSIM.
+    - SSIM is the most expensive of the metrics. The `fast` mode processes a third of the data, which is useful for 
+      screening runs, but its values are not directly comparable to the default three-channel SSIM.
+    """
+    rounder = lambda x, digits=4: round(x, digits)
+
+    # PSNR is computed directly, instead of through skimage, to avoid its float64 copies of both images. 
+    # The squared differences of 8-bit values are exact in float32; the mean is accumulated in float64. 
+    diff = original_image.astype(np.float32) - compressed_image.astype(np.float32)
+    mse = float(np.mean(np.square(diff, out=diff), dtype=np.float64))
+    peak_signal_noise_ratio = rounder(float(10 * np.log10(255 ** 2 / mse))) if mse else float("inf")
+
+    if fast:
+        structural_similarity = rounder(float(ssim(
+            _get_luminance(original_image), _get_luminance(compressed_image), data_range=255, channel_axis=None
+        )))
+    else:
+        structural_similarity = rounder(float(ssim(original_image, compressed_image, data_range=255, channel_axis=2)))
 
+    return {
+        "peak_signal_noise_ratio": peak_signal_noise_ratio, 
+        "structural_similarity": structural_similarity
+    }
 
-def calculate_metrics(original_image_path: str, compressed_image_path: str) -> Dict[str, float]:
+
+def calculate_metrics_from_arrays(
+        original_image: np.ndarray, 
+        compressed_image: np.ndarray, 
+        original_size: int, 
+        compressed_size: int, 
+        fast: bool = False
+) -> Dict[str, float]:
+    """
+    Calculate the compression metrics between the original and compressed images, given as arrays.
+
+    This function computes the same metrics as `calculate_metrics`, but takes the images and their file sizes 
+    directly, which avoids decoding images that are already in memory.
+
+    Parameters
+    ----------
+    original_image : np.ndarray
+        The original image in RGB format.
+    compressed_image : np.ndarray
+        The compressed image in RGB format.
+    original_size : int
+        The size of the original image file in bytes.
+    compressed_size : int
+        The size of the compressed image file in bytes.
+    fast : bool, optional
+        If True, SSIM is computed on the luminance channel only, instead of on all three channels. Defaults to False.
+
+    Returns
+    -------
+    dict
+        A dictionary containing the following keys:
+        - `compression_ratio`: The ratio of the original image size to the compressed image size.
+        - `peak_signal_noise_ratio`: The PSNR value between the original and compressed images.
+        - `structural_similarity`: The SSIM value between the original and compressed images.
+
+    Notes
+    -----
+    - PSNR and SSIM are computed by `_calculate_image_quality`.
+    """
+    metrics = {
+        "compression_ratio": round(original_size / compressed_size, 4), 
+        **_calculate_image_quality(original_image, compressed_image, fast=fast)
+    }
+
+    return metrics
+
+
+def calculate_metrics(original_image_path: str, compressed_image_path: str, fast: bool = False) -> Dict[str, float]:
     """
     Calculate the compression metrics between the original and compressed images.
 
@@ -38,6 +215,8 @@ def calculate_metrics(original_image_path: str, compressed_image_path: str) -> D
         The file path of the original image to compare.
     compressed_image_path : str
         The file path of the compressed image to compare.
+    fast : bool, optional
+        If True, SSIM is computed on the luminance channel only. Defaults to False.
 
     Returns
     -------
@@ -52,26 +231,24 @@ def calculate_metrics(original_image_path: str, compressed_image_path: str) -> D
     - The function handles `.png` and `.jp2` formats for the compressed image.
     - PSNR and SSIM are computed using the original and compressed images.
     - The compression ratio is calculated as the ratio of file sizes.
+    - If the images are already in memory, use `calculate_metrics_from_arrays` instead.
     """
 
-    original_image = cv2.cvtColor(cv2.imread(original_image_path), cv2.COLOR_BGR2RGB)
+    # The originals are compared against every compression parameter, so they are cached. Each compressed image is 
+    # only read once, and caching it would evict the originals. 
+    original_image = _load_png(original_image_path)
     if compressed_image_path.endswith(".png"):
-        compressed_image = cv2.cvtColor(cv2.imread(compressed_image_path), cv2.COLOR_BGR2RGB)
+        compressed_image = _decode_png(compressed_image_path)
     else:
         compressed_image = glymur.Jp2k(compressed_image_path)[:]
 
-    rounder = lambda x, digits=4: round(x, digits)
-    compression_ratio = rounder(os.path.getsize(original_image_path)/ os.path.getsize(compressed_image_path))
-    peak_signal_noise_ratio = rounder(float(psnr(original_image, compressed_image)))
-    structural_similarity = rounder(float(ssim(original_image, compressed_image, channel_axis=2)))
-    
-    metrics = {
-        "compression_ratio": compression_ratio, 
-        "peak_signal_noise_ratio": peak_signal_noise_ratio, 
-        "structural_similarity": structural_similarity
-    }
-
-    return metrics
+    return calculate_metrics_from_arrays(
+        original_image, 
+        compressed_image, 
+        os.path.getsize(original_image_path), 
+        os.path.getsize(compressed_image_path), 
+        fast=fast
+    )
 
 
 def save_metrics(compressed: Dict[str, Dict[str, Union[List[np.ndarray], pd.DataFrame]]], method: Literal["jp2", "svd"]) -> None:
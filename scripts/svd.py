@@ -1,123 +1,583 @@
 import numpy as np
-from typing import Dict, Tuple, Union
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Tuple, Union
 
 
-__all__ = ["compress_image_using_svd"]
+__all__ = ["compress_image_using_svd", "precompute_svd", "reconstruct_from_svd"]
 
 
-def _compute_svd(image: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+# Names of the channels of an RGB image, in order. Used as the keys of the compression metadata. 
+_COLORS = ["red", "green", "blue"]
+
+# Datatypes in which the retained SVD factors can be stored. 
+_STORE_DTYPES = [np.float16, np.float32, np.int8]
+
+# Fraction of the rank of a channel above which the randomized SVD is not used. A randomized SVD of k components 
+# costs about 1.85 * k / rank full SVDs (float32, 512 x 768 channels), so a failed attempt and a retry below this 
+# fraction still cost less than one full SVD. 
+_MAX_RANDOMIZED_FRACTION = 0.25
+
+# Number of times the number of components of the randomized SVD is doubled, before falling back to the full SVD. 
+_MAX_DOUBLINGS = 1
+
+
+def _get_total_variance(image: np.ndarray, block_rows: int = 512) -> np.ndarray:
+    """
+    Get the total variance of each channel of the input image.
+
+    The total variance of a channel is the sum of the squares of its singular values, which is equal to its 
+    squared Frobenius norm. Computing it from the pixels allows the explained variance to be calculated from 
+    a truncated set of singular values.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        The input image in RGB format (height, width, 3), with 8-bit pixel values.
+    block_rows : int, optional
+        The number of rows of the image that are squared at a time, by default 512.
+
+    Returns
+    -------
+    np.ndarray
+        A 1D array of length 3, containing the total variance of the red, green, and blue channels.
+    """
+    total_variance = np.zeros(image.shape[-1], dtype=np.float64)
+
+    # The squares are computed over blocks of rows in float32, which is exact for 8-bit pixel values, so that no 
+    # float64 copy of the image is made. They are summed in float64, which is exact for the integer totals. 
+    for start in range(0, image.shape[0], block_rows):
+        block = image[start:start + block_rows]
+        total_variance += np.square(block, dtype=np.float32).sum(axis=(0, 1), dtype=np.float64)
+
+    return total_variance
+
+
+def _randomized_svd(
+        channel: np.ndarray, 
+        n_components: int, 
+        n_oversamples: int = 10, 
+        n_iter: int = 4, 
+        random_state: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute a truncated SVD of a matrix using randomized range finding.
+
+    This function projects the matrix onto a random subspace, refines that subspace using power iterations, 
+    and computes the exact SVD of the much smaller projected matrix. Only the top `n_components` singular 
+    triplets are returned.
+
+    Parameters
+    ----------
+    channel : np.ndarray
+        The matrix to decompose (2D array).
+    n_components : int
+        The number of singular values and vectors to compute.
+    n_oversamples : int, optional
+        The number of additional random vectors used to sample the range of the matrix, by default 10.
+    n_iter : int, optional
+        The number of power iterations, by default 4. Image spectra decay slowly, and two iterations leave 
+        the reconstruction error of the mid-range components noticeably above that of the exact SVD.
+    random_state : int, optional
+        The seed for the random number generator, by default 0.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The truncated U matrix (m, n_components), singular values (n_components,), and V^T matrix (n_components, n).
+
+    Notes
+    -----
+    - The cost is O(m * n * n_components), instead of O(m * n * min(m, n)) for the full SVD.
+    - The subspace is re-orthonormalized with a QR decomposition after every multiplication, to preserve accuracy.
+    """
+    rng = np.random.default_rng(random_state)
+    m, n = channel.shape
+    n_random = min(n_components + n_oversamples, m, n)
+
+    q, _ = np.linalg.qr(channel @ rng.standard_normal((n, n_random), dtype=channel.dtype))
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(channel.T @ q)
+        q, _ = np.linalg.qr(channel @ q)
+
+    u_small, sigma, vt = np.linalg.svd(q.T @ channel, full_matrices=False)
+    u = q @ u_small
+
+    return u[:, :n_components], sigma[:n_components], vt[:n_components]
+
+
+def _incremental_svd(
+        channel: np.ndarray, 
+        n_components: int, 
+        block_rows: int = 128, 
+        reorthogonalize_every: int = 8
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute a truncated SVD of a matrix by updating it with one block of rows at a time.
+
+    This function computes the SVD of the first block of rows, and then appends each following block by projecting 
+    it onto the current row space, orthonormalizing the residual, and taking the SVD of a small core matrix. The 
+    factors are truncated back to `n_components` after every update.
+
+    Parameters
+    ----------
+    channel : np.ndarray
+        The matrix to decompose (2D array). It is read one block of rows at a time, and each block is cast to 
+        `np.float32`, so it may be an integer array or a `np.memmap`.
+    n_components : int
+        The number of singular values and vectors to compute.
+    block_rows : int, optional
+        The number of rows appended in each update, by default 128. The working memory grows linearly with it, 
+        and the truncation error shrinks slowly with it.
+    reorthogonalize_every : int, optional
+        The number of updates before the first re-orthogonalization of the factors, by default 8. The interval 
+        doubles after each re-orthogonalization.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The truncated U matrix (m, n_components), singular values (n_components,), and V^T matrix (n_components, n).
+
+    Notes
+    -----
+    - Apart from U, the working memory is O(n * (n_components + block_rows)), so the full matrix is never cast 
+      to floating point or decomposed at once.
+    - If the factors are U Σ V^T and the new rows are B = P V^T + R^T Q^T, with P = B V, then the stacked matrix is 
+      diag(U, I) [[Σ, 0], [P, R^T]] [V^T; Q^T]. Only the SVD of the small core matrix in the middle is needed.
+    - As in Brand's incremental SVD, the rows of U are not rotated by every update. The k x k rotations are 
+      accumulated instead, and each new block of rows is stored multiplied by the pseudo-inverse of the accumulated 
+      rotation. The rotation is applied to the stored rows once at the end, so each update costs O(n * k^2) 
+      regardless of the number of rows already processed.
+    - The truncation is applied to every update, so the result is an approximation of the exact truncated SVD. 
+      Rounding errors also accumulate in the bases and in the rotation, so the rotation is applied and the bases are 
+      re-orthonormalized with QR decompositions after `reorthogonalize_every` updates, and then at doubling 
+      intervals, which keeps the total cost linear in the number of rows.
+    """
+    m, n = channel.shape
+    n_components = min(n_components, m, n)
+
+    first_rows = max(n_components, block_rows)
+    u, sigma, vt = np.linalg.svd(np.asarray(channel[:first_rows], dtype=np.float32), full_matrices=False)
+    u, sigma, vt = u[:, :n_components], sigma[:n_components], vt[:n_components]
+
+    # U is stored as its row blocks W, with U = W @ rotation, so that each update only rotates a small matrix. 
+    u_blocks = [u]
+    rotation = np.eye(len(sigma), dtype=np.float32)
+    next_reorthogonalization = reorthogonalize_every
+
+    for update, start in enumerate(range(first_rows, m, block_rows), start=1):
+        block = np.asarray(channel[start:start + block_rows], dtype=np.float32)
+        k = len(sigma)
+
+        # Split the new rows into their projection onto the current row space, and an orthonormal residual. 
+        projection = block @ vt.T
+        q, r = np.linalg.qr((block - projection @ vt).T)
+
+        core = np.zeros((k + block.shape[0], k + r.shape[0]), dtype=np.float32)
+        core[:k, :k] = np.diag(sigma)
+        core[k:, :k] = projection
+        core[k:, k:] = r.T
+        u_core, sigma, vt_core = np.linalg.svd(core, full_matrices=False)
+
+        # Rotate the bases by the SVD of the core, keeping only the top components. The existing rows of U are 
+        # rotated through `rotation`, and the new rows are stored so that the same rotation recovers them. 
+        k_new = min(n_components, len(sigma))
+        rotation = rotation @ u_core[:k, :k_new]
+        u_blocks.append(u_core[k:, :k_new] @ np.linalg.pinv(rotation))
+        vt = vt_core[:k_new, :k] @ vt + vt_core[:k_new, k:] @ q.T
+        sigma = sigma[:k_new]
+
+        if update == next_reorthogonalization:
+            q_u, r_u = np.linalg.qr(np.vstack(u_blocks) @ rotation)
+            q_v, r_v = np.linalg.qr(vt.T)
+            u_core, sigma, vt_core = np.linalg.svd((r_u * sigma) @ r_v.T)
+            u_blocks, vt = [q_u @ u_core], vt_core @ q_v.T
+            rotation = np.eye(len(sigma), dtype=np.float32)
+            next_reorthogonalization *= 2
+
+    return np.vstack(u_blocks) @ rotation, sigma, vt
+
+
+def _estimate_num_components(
+        channel: np.ndarray, 
+        explained_variance: float, 
+        sample_fraction: float = 0.25, 
+        random_state: int = 0, 
+        max_rows: int | None = None
+) -> int:
+    """
+    Estimate the number of components required to explain a given variance of a matrix.
+
+    This function computes the singular values of a random subsample of the rows of the matrix, and finds the 
+    number of components that explain `explained_variance` of the variance of the subsample.
+
+    Parameters
+    ----------
+    channel : np.ndarray
+        The matrix to decompose (2D array).
+    explained_variance : float
+        The fraction of variance to explain, between 0 and 1.
+    sample_fraction : float, optional
+        The fraction of rows to sample, by default 0.25.
+    random_state : int, optional
+        The seed for the random number generator, by default 0.
+    max_rows : int, optional
+        The largest number of rows to sample. If provided, the memory used by the estimate does not grow with the 
+        number of rows of the matrix.
+
+    Returns
+    -------
+    int
+        The estimated number of components.
+
+    Notes
+    -----
+    - The subsample has a lower rank than the full matrix, so the estimate tends to be lower than the true value.
+    """
+    rng = np.random.default_rng(random_state)
+    num_rows = max(1, int(channel.shape[0] * sample_fraction))
+    if max_rows is not None:
+        num_rows = min(num_rows, max_rows)
+    rows = np.sort(rng.choice(channel.shape[0], size=num_rows, replace=False))
+
+    sigma = np.linalg.svd(channel[rows].astype(np.float32, copy=False), compute_uv=False)
+    k, _ = _get_num_components(sigma, np.sum(np.square(sigma, dtype=np.float64)), explained_variance)
+
+    return k
+
+
+def _compute_truncated_svd(
+        channel: np.ndarray, 
+        total_variance: float, 
+        explained_variance: float, 
+        k_components: int | None, 
+        max_components: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """
+    Compute a truncated SVD of a channel with enough components to satisfy `explained_variance` or `k_components`.
+
+    If `k_components` is given, exactly that many components are computed. Otherwise, the number of components 
+    is estimated from a subsample of the rows, and doubled until the retained singular values explain at least 
+    `explained_variance` of `total_variance`, at most `_MAX_DOUBLINGS` times.
+
+    Parameters
+    ----------
+    channel : np.ndarray
+        The image channel to decompose (2D array).
+    total_variance : float
+        The total variance of the channel.
+    explained_variance : float
+        The fraction of variance to retain, between 0 and 1.
+    k_components : int or None
+        The number of components to retain. If provided, `explained_variance` is ignored.
+    max_components : int
+        The largest number of components for which the randomized SVD is used (see `_MAX_RANDOMIZED_FRACTION`).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray] or None
+        The truncated U matrix, singular values, and V^T matrix, or `None` if the full SVD should be used instead.
+
+    Notes
+    -----
+    - The full SVD is chosen before any randomized SVD is computed if the starting number of components is 
+      already above `max_components`, and after a failed attempt if the doubled number would be.
+    """
+    if k_components:
+        if k_components > max_components:
+            return None
+        return _randomized_svd(channel, k_components)
+
+    # The estimate is usually low, so start with twice as many components. 
+    n_components = 2 * _estimate_num_components(channel, explained_variance)
+    for _ in range(_MAX_DOUBLINGS + 1):
+        if n_components > max_components:
+            return None
+        u, sigma, vt = _randomized_svd(channel, n_components)
+        _, variance = _get_num_components(sigma, total_variance, explained_variance)
+        if variance >= explained_variance:
+            return u, sigma, vt
+        n_components *= 2
+
+    return None
+
+
+def _compute_incremental_svd(
+        channel: np.ndarray, 
+        total_variance: float, 
+        explained_variance: float, 
+        k_components: int | None, 
+        estimate_rows: int = 256
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute an incremental truncated SVD of a channel with enough components to satisfy `explained_variance` or 
+    `k_components`.
+
+    This follows `_compute_truncated_svd`, using `_incremental_svd` instead of the randomized SVD. There is no 
+    fallback to the full SVD, so the number of components is doubled up to the rank of the channel.
+
+    Parameters
+    ----------
+    channel : np.ndarray
+        The image channel to decompose (2D array), in its original datatype.
+    total_variance : float
+        The total variance of the channel.
+    explained_variance : float
+        The fraction of variance to retain, between 0 and 1.
+    k_components : int or None
+        The number of components to retain. If provided, `explained_variance` is ignored.
+    estimate_rows : int, optional
+        The number of rows sampled to estimate the number of components, by default 256. A fixed number of rows 
+        keeps the memory of the estimate independent of the height of the channel.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The truncated U matrix, singular values, and V^T matrix.
+    """
+    if k_components:
+        return _incremental_svd(channel, k_components)
+
+    max_components = min(channel.shape)
+    n_components = 2 * _estimate_num_components(channel, explained_variance, max_rows=estimate_rows)
+    while True:
+        u, sigma, vt = _incremental_svd(channel, min(n_components, max_components))
+        _, variance = _get_num_components(sigma, total_variance, explained_variance)
+        if variance >= explained_variance or n_components >= max_components:
+            return u, sigma, vt
+        n_components *= 2
+
+
+def _full_svd(channel: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the reduced SVD of a matrix, decomposing a wide matrix in its tall orientation.
+
+    Parameters
+    ----------
+    channel : np.ndarray
+        The matrix to decompose (2D array).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The U matrix, singular values, and V^T matrix, as returned by `np.linalg.svd` with `full_matrices=False`.
+
+    Notes
+    -----
+    - LAPACK's divide-and-conquer SVD is faster on tall matrices. If A^T = U' Σ V'^T, then A = V' Σ U'^T, so the 
+      factors of a wide matrix are recovered by transposing those of its transpose.
+    """
+    if channel.shape[0] < channel.shape[1]:
+        u_t, sigma, vt_t = np.linalg.svd(channel.T, full_matrices=False)
+        return vt_t.T, sigma, u_t.T
+
+    return np.linalg.svd(channel, full_matrices=False)
+
+
+def _compute_channel_svd(
+        channel: np.ndarray, 
+        total_variance: float, 
+        explained_variance: float, 
+        k_components: int | None, 
+        max_components: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the SVD of a channel, using the truncated SVD if it is cheaper, and the full SVD otherwise.
+
+    The parameters are those of `_compute_truncated_svd`.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The U matrix, singular values, and V^T matrix of the channel.
+    """
+    truncated_svd = _compute_truncated_svd(channel, total_variance, explained_variance, k_components, max_components)
+    if truncated_svd is None:
+        return _full_svd(channel)
+
+    return truncated_svd
+
+
+@contextlib.contextmanager
+def _channel_pool(num_channels: int, parallel: bool):
+    """
+    Yield a `map` function over the channels of an image, backed by a thread pool with one thread per channel 
+    if `parallel` is True, and by the builtin `map` otherwise.
+    """
+    if not parallel:
+        yield map
+        return
+
+    with ThreadPoolExecutor(max_workers=num_channels) as pool:
+        yield pool.map
+
+
+def _compute_svd(
+        image: np.ndarray, 
+        total_variance: np.ndarray, 
+        explained_variance: float = 0.975, 
+        k_components: int = None, 
+        incremental_threshold: int | None = None, 
+        parallel_channels: bool = True
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
     """
     Compute the Singular Value Decomposition (SVD) of each channel of the input image.
 
     This function decomposes the input image into its red, green, and blue channels, 
     and computes the Singular Value Decomposition (SVD) for each channel separately.
     The SVD of each channel is returned as a tuple containing the U, Σ (singular values), 
-    and V^T matrices.
+    and V^T matrices. Only as many components as are needed to satisfy `explained_variance` 
+    or `k_components` are guaranteed to be computed.
 
     Parameters
     ----------
     image : np.ndarray
         The input image in RGB format (height, width, 3), where each pixel has a red, green, and blue value.
+    total_variance : np.ndarray
+        The total variance of each channel, as returned by `_get_total_variance`.
+    explained_variance : float, optional
+        The fraction of variance to retain for each channel, by default 0.975.
+    k_components : int, optional
+        The number of components to retain for each channel. If provided, `explained_variance` is ignored.
+    incremental_threshold : int, optional
+        The size in bytes of a `np.float32` channel above which the incremental SVD is used (see `_incremental_svd`). 
+        If not provided, the incremental SVD is never used.
+    parallel_channels : bool, optional
+        If True (default), the channels are decomposed concurrently in a thread pool. Otherwise, they are 
+        decomposed one after another in the calling thread.
 
     Returns
     -------
-    dict
-        A dictionary where the keys are the color channels (`'red'`, `'green'`, `'blue'`), 
-        and the values are tuples containing the SVD results for each channel:
+    list
+        A list with one entry per channel, in the order of the last axis of `image`. Each entry is a 
+        tuple containing the SVD results for that channel:
         - The first element of the tuple is the U matrix.
         - The second element is the singular values (Σ).
         - The third element is the V^T matrix.
 
     Notes
     -----
-    - The function performs the SVD independently for each RGB channel.
-    - `np.linalg.svd` is used with `full_matrices=False` to return the reduced form of the SVD.
+    - The function performs the SVD independently for each RGB channel, using a thread pool with one thread per 
+      channel if `parallel_channels` is True. LAPACK releases the GIL, so the decompositions run concurrently. 
+      Callers that already decompose several images in parallel should disable this, so that the number of 
+      threads does not multiply.
+    - A randomized truncated SVD is used when the required number of components is small. Otherwise, 
+      `np.linalg.svd` is used with `full_matrices=False` to return the reduced form of the SVD (see `_full_svd`). 
+      Each channel falls back to the full SVD in its own thread, because a batched call would decompose the 
+      channels one after another.
+    - The channels are cast to `np.float32` before the decomposition, so the SVD matrices are `np.float32` as well.
+    - Channels larger than `incremental_threshold` are decomposed one block of rows at a time instead, without 
+      casting the whole image or falling back to the full SVD, to bound the peak memory for very large images. 
+      Together with the blockwise `_get_total_variance` and an estimate of the number of components from a fixed 
+      number of rows, the working memory per channel then grows with the width, but not the height, of the image, 
+      apart from the U matrix.
     """
-    # Separate the channels of the image. 
-    red_channel, green_channel, blue_channel = image[:, :, 0], image[:, :, 1], image[:, :, 2]
-
-    # Compute the SVD for each channel separately. 
-    red_svd = np.linalg.svd(red_channel, full_matrices=False)  
-    green_svd = np.linalg.svd(green_channel, full_matrices=False)
-    blue_svd = np.linalg.svd(blue_channel, full_matrices=False)
-
-    return {
-        "red": red_svd, 
-        "green": green_svd, 
-        "blue": blue_svd, 
-    }
-
-
-def _get_top_k_singular_values(sigma: np.ndarray, k: int) -> np.ndarray:
+    height, width = image.shape[:2]
+    if incremental_threshold is not None and height * width * np.dtype(np.float32).itemsize > incremental_threshold:
+        with _channel_pool(image.shape[-1], parallel_channels) as map_channels:
+            return list(map_channels(
+                _compute_incremental_svd, 
+                np.moveaxis(image, -1, 0), 
+                total_variance, 
+                repeat(explained_variance), 
+                repeat(k_components)
+            ))
+
+    # Move the channels to the leading axis, so that each channel can be decomposed in its own thread. 
+    # float32 is sufficient for 8-bit image data, and is half the size of the float64 that numpy would upcast to. 
+    channels = np.moveaxis(image, -1, 0).astype(np.float32)
+
+    max_components = int(min(channels.shape[1:]) * _MAX_RANDOMIZED_FRACTION)
+
+    # The channels are independent, and LAPACK releases the GIL, so they can be decomposed concurrently. 
+    with _channel_pool(len(channels), parallel_channels) as map_channels:
+        return list(map_channels(
+            _compute_channel_svd, 
+            channels, 
+            total_variance, 
+            repeat(explained_variance), 
+            repeat(k_components), 
+            repeat(max_components)
+        ))
+
+
+def _get_explained_variance(sigma: np.ndarray, total_variance: float, k: int) -> float:
     """
-    Returns an array with the top k singular values and zeros for the remaining elements.
+    Get the fraction of variance explained by the top k singular values of a matrix.
 
-    This function creates a new array with the same shape as the input singular values array (`sigma`),
-    where the first `k` elements are the first `k` singular values from `sigma`, and the remaining elements 
-    are set to zero.
+    The variance explained by a singular value is its square. The fraction explained by the top k singular values 
+    is the sum of their squares, divided by the total variance (sum of squares of all singular values).
 
     Parameters
     ----------
     sigma : np.ndarray
-        The array of singular values (1D array).
+        The array of singular values (1D array) from the Singular Value Decomposition (SVD). This may be 
+        truncated to the top singular values.
+    total_variance : float
+        The sum of squares of all singular values of the matrix, i.e. its squared Frobenius norm.
     k : int
-        The number of top singular values to retain.
+        The number of top singular values.
 
     Returns
     -------
-    np.ndarray
-        A 1D array of the same shape as `sigma`, where the first `k` values are the top `k` singular values 
-        from `sigma` and the remaining values are zeros.
+    float
+        The fraction of the total variance explained by the top k singular values.
 
     Notes
     -----
-    - If `k` is greater than the length of `sigma`, the function will return an array with zeros for all elements.
+    - The total variance is passed in, rather than calculated from `sigma`, so that truncated singular values 
+      are supported.
     """
-    sigma_aux = np.zeros_like(sigma)
-    sigma_aux[:k] = sigma[:k]
-    return sigma_aux
+    return float(np.sum(np.square(sigma[:k], dtype=np.float64)) / total_variance)
 
 
-def _get_explained_variance(sigma: np.ndarray) -> np.ndarray:
+def _get_num_components(sigma: np.ndarray, total_variance: float, explained_variance: float) -> Tuple[int, float]:
     """
-    Get the cumulative explained variance from the singular values of a matrix.
-
-    This function calculates the explained variance for each singular value, which is the square of the singular 
-    values divided by the total variance (sum of squares of all singular values). Then, it computes the cumulative 
-    explained variance by summing these individual explained variances.
+    Get the minimum number of components required to explain a given variance, and the variance they explain.
 
     Parameters
     ----------
     sigma : np.ndarray
-        The array of singular values (1D array) from the Singular Value Decomposition (SVD).
+        The array of singular values (1D array) from the Singular Value Decomposition (SVD). This may be 
+        truncated to the top singular values.
+    total_variance : float
+        The sum of squares of all singular values of the matrix, i.e. its squared Frobenius norm.
+    explained_variance : float
+        The fraction of variance to explain, between 0 and 1.
 
     Returns
     -------
-    np.ndarray
-        A 1D array containing the cumulative explained variance. Each element represents the cumulative 
-        explained variance up to the corresponding singular value.
+    Tuple[int, float]
+        The number of components, and the fraction of variance explained by them.
 
     Notes
     -----
-    - The total variance is calculated as the sum of the squares of the singular values.
-    - The explained variance for each singular value is its squared value divided by the total variance.
-    - The cumulative explained variance is computed using the `np.cumsum` function.
+    - The cumulative sum of squared singular values is non-decreasing, so a binary search finds the first component 
+      reaching the threshold.
+    - The threshold is scaled by the total variance, instead of normalizing the whole cumulative sum, so that only 
+      the explained variance of the selected component is divided.
+    - If the threshold is not reached, all components in `sigma` are used.
     """
-    total_variance = np.sum(sigma ** 2)
-    variance_explained = (sigma ** 2) / total_variance
-    cumulative_variance = np.cumsum(variance_explained)
+    cumulative_sum = np.cumsum(np.square(sigma, dtype=np.float64))
+    k = min(int(np.searchsorted(cumulative_sum, explained_variance * total_variance) + 1), len(sigma))
 
-    return cumulative_variance
+    return k, float(cumulative_sum[k - 1] / total_variance)
 
 
-def _reconstruct_channel(u: np.ndarray, sigma: np.ndarray, vt: np.ndarray) -> np.ndarray:
+def _reconstruct_channel(
+        u: np.ndarray, 
+        sigma: np.ndarray, 
+        vt: np.ndarray, 
+        k: int, 
+        out: np.ndarray | None = None
+) -> np.ndarray:
     """
-    Reconstruct an image channel from its SVD matrices.
+    Reconstruct an image channel from the top k components of its SVD matrices.
 
     This function reconstructs an image channel using its Singular Value Decomposition (SVD) components 
-    (U, Sigma, V^T). It computes the product of U, the diagonal matrix of singular values, and V^T to 
-    obtain the reconstructed image. The values are then scaled to the range [0, 255] to ensure the pixel 
-    values are within the valid range for image representation.
+    (U, Sigma, V^T). It computes the product of the first k columns of U, scaled by the top k singular values, 
+    and the first k rows of V^T to obtain the reconstructed image.
 
     Parameters
     ----------
@@ -127,101 +587,347 @@ def _reconstruct_channel(u: np.ndarray, sigma: np.ndarray, vt: np.ndarray) -> np
         The array of singular values from the SVD of the image channel (1D array).
     vt : np.ndarray
         The V^T matrix from the SVD of the image channel (2D array).
+    k : int
+        The number of top components to use for the reconstruction.
+    out : np.ndarray, optional
+        A 2D array of the same shape as the channel, into which the reconstruction is written. If not provided, 
+        a new array is allocated.
+
+    Returns
+    -------
+    np.ndarray
+        A 2D array representing the reconstructed image channel. The values are not clipped to the valid 
+        range of pixel values; see `_clip_to_uint8`.
+
+    Notes
+    -----
+    - The reconstruction is performed as a single matrix product of the rank-k slices, `(U_k * Sigma_k) @ V^T_k`, 
+      which avoids building Sigma as a dense diagonal matrix.
+    """
+    return np.matmul(u[:, :k] * sigma[:k], vt[:k, :], out=out)
+
+
+def _clip_to_uint8(reconstructed: np.ndarray) -> np.ndarray:
+    """
+    Round the reconstructed channels of an image to the nearest integer, clip them to the range [0, 255], and convert 
+    them to `np.uint8`.
+
+    Parameters
+    ----------
+    reconstructed : np.ndarray
+        The reconstructed channels, stacked along the first axis (3, height, width). This array is rounded and clipped 
+        in place.
 
     Returns
     -------
     np.ndarray
-        A 2D array representing the reconstructed image channel, with pixel values in the range [0, 255],
+        A 3D array (height, width, 3) representing the reconstructed image, with pixel values in the range [0, 255], 
         converted to `np.uint8`.
 
     Notes
     -----
-    - The reconstruction is performed by calculating the dot product of U, Sigma (as a diagonal matrix), and V^T.
-    - Min-max scaling is applied to the reconstructed image to ensure that its pixel values lie within the range [0, 255].
+    - The low-rank approximation may overshoot the valid range of pixel values slightly. Clipping removes the 
+      overshoot without changing the values that are already valid, so the colors stay faithful to the original. 
+      Min-max scaling would instead stretch or shift every pixel of the channel.
+    - The values are rounded before the conversion, which would otherwise truncate them and bias every pixel down 
+      by half a level on average.
     - The resulting image is converted to the `np.uint8` datatype to match the raw image format.
     """
+    np.rint(reconstructed, out=reconstructed)
+    np.clip(reconstructed, 0, 255, out=reconstructed)
 
-    reconstructed_img = np.dot(u, np.dot(np.diag(sigma), vt))
+    # Converting the datatype to uint8 to match raw images datatype
+    return np.moveaxis(reconstructed, 0, -1).astype(np.uint8, order="C")
 
-    # Min-max scaling to ensure that the values lie within the valid range of [0, 255]
-    min_val, max_val = np.min(reconstructed_img), np.max(reconstructed_img)
-    scaled_img = ((reconstructed_img - min_val) * 255) / (max_val - min_val)
 
-    # Converting the datatype to uint8 to match raw images datatype
-    return scaled_img.astype(np.uint8)
+def _quantize_factors(
+        u: np.ndarray, 
+        sigma: np.ndarray, 
+        vt: np.ndarray, 
+        store_dtype: np.dtype
+) -> Dict[str, np.ndarray]:
+    """
+    Convert the retained SVD factors of a channel to a compact datatype for storage.
+
+    Parameters
+    ----------
+    u : np.ndarray
+        The retained columns of the U matrix (m, k).
+    sigma : np.ndarray
+        The retained singular values (k,).
+    vt : np.ndarray
+        The retained rows of the V^T matrix (k, n).
+    store_dtype : np.dtype
+        The datatype to store U and V^T in: `np.float16`, `np.float32`, or `np.int8`.
 
+    Returns
+    -------
+    dict
+        A dictionary containing `"u"`, `"sigma"`, and `"vt"`. For `np.int8`, it also contains `"u_scale"` and 
+        `"vt_scale"`, the scales of the columns of U and of the rows of V^T.
 
-def compress_image_using_svd(
+    Notes
+    -----
+    - The singular values are always stored as `np.float32`. Those of 8-bit channels can exceed the range of 
+      `np.float16`, and there are only k of them.
+    - For `np.int8`, each column of U and each row of V^T is scaled so that its largest absolute value maps to 127. 
+      The singular vectors have unit norm, so their entries are of similar magnitude, and a per-vector scale loses 
+      little precision.
+    """
+    factors = {"sigma": sigma.astype(np.float32)}
+    if store_dtype != np.int8:
+        factors["u"] = u.astype(store_dtype)
+        factors["vt"] = vt.astype(store_dtype)
+        return factors
+
+    for name, matrix, axis in [("u", u, 0), ("vt", vt, 1)]:
+        scale = np.abs(matrix).max(axis=axis, keepdims=True) / 127
+        scale[scale == 0] = 1
+        factors[name] = np.rint(matrix / scale).astype(np.int8)
+        factors[f"{name}_scale"] = scale.astype(np.float32)
+
+    return factors
+
+
+def _dequantize_factors(factors: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert the stored SVD factors of a channel, as returned by `_quantize_factors`, back to `np.float32`.
+
+    Parameters
+    ----------
+    factors : dict
+        The stored factors of the channel.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The U matrix, singular values, and V^T matrix, as `np.float32`.
+    """
+    u = factors["u"].astype(np.float32)
+    vt = factors["vt"].astype(np.float32)
+    if "u_scale" in factors:
+        u *= factors["u_scale"]
+        vt *= factors["vt_scale"]
+
+    return u, factors["sigma"], vt
+
+
+def precompute_svd(
         image: np.ndarray, 
         explained_variance: float = 0.975, 
-        k_components: int = None
-) -> Tuple[np.ndarray, Dict[str, Dict[str, Union[float, int]]]]:
+        k_components: int = None, 
+        incremental_threshold: int | None = None, 
+        parallel_channels: bool = True
+) -> Dict[str, Union[List[Tuple[np.ndarray, np.ndarray, np.ndarray]], np.ndarray]]:
     """
-    Compress an image using Singular Value Decomposition (SVD).
+    Compute the channel-wise SVD of an image, for reconstruction at one or more compression levels.
 
-    This function compresses each channel of the input image by retaining the most significant singular values 
-    based on either the explained variance or the specified number of components (`k_components`). The compression 
-    ensures that for each channel, at least `explained_variance` percent of the variance is preserved. If the 
-    `k_components` parameter is provided, the explained variance is ignored, and the number of components is 
-    fixed to `k_components`.
+    The SVD does not depend on the compression level, only the number of retained components does. Computing it 
+    once with this function and reconstructing it with `reconstruct_from_svd` for each level avoids repeating 
+    the decomposition in parameter sweeps.
 
     Parameters
     ----------
     image : np.ndarray
         The input image to compress, represented as a 3D NumPy array (height, width, 3) in RGB format.
+    explained_variance : float, optional
+        The largest fraction of variance that will be retained for any channel in `reconstruct_from_svd`. 
+        The default value is 0.975 (97.5% variance explained).
+    k_components : int, optional
+        The largest number of components that will be retained for any channel in `reconstruct_from_svd`. 
+        If provided, `explained_variance` is ignored.
+    incremental_threshold : int, optional
+        The size in bytes of a channel, in `np.float32`, above which the SVD is computed incrementally over blocks 
+        of rows to bound the peak memory. By default, the incremental SVD is not used.
+    parallel_channels : bool, optional
+        Whether to decompose the channels concurrently, with one thread per channel. Defaults to True. Set it to 
+        False when several images are already decomposed in parallel, to avoid nested thread pools.
+
+    Returns
+    -------
+    dict
+        A dictionary containing:
+        - `"svd"`: A list with the (U, Σ, V^T) tuple of each channel, in channel order.
+        - `"total_variance"`: A 1D array containing the total variance of each channel.
+
+    Raises
+    ------
+    ValueError
+        If `image` is not of dtype `np.uint8`.
+
+    Notes
+    -----
+    - Only as many components as are needed for `explained_variance` or `k_components` are guaranteed to be 
+      computed, so these must be at least as large as those passed to `reconstruct_from_svd`.
+    - The SVD is computed in `np.float32`. 8-bit pixel values are represented exactly in `np.float32`, but the 
+      decomposition itself is subject to floating-point rounding.
+    """
+    # The reconstruction is clipped to the 8-bit range, so other image formats are not supported. 
+    if image.dtype != np.uint8:
+        raise ValueError(f"image must be of dtype uint8, got {image.dtype}")
+
+    k_given = bool(k_components)
+
+    total_variance = _get_total_variance(image)
+    svd = _compute_svd(
+        image, total_variance, explained_variance, k_components if k_given else None, incremental_threshold, 
+        parallel_channels
+    )
+
+    return {
+        "svd": svd, 
+        "total_variance": total_variance
+    }
+
+
+def reconstruct_from_svd(
+        image_svd: Dict[str, Union[List[Tuple[np.ndarray, np.ndarray, np.ndarray]], np.ndarray]], 
+        explained_variance: float = 0.975, 
+        k_components: int = None, 
+        store_dtype: np.dtype = None
+) -> Tuple[np.ndarray, Dict[str, Dict[str, Union[float, int]]]]:
+    """
+    Reconstruct a compressed image from the SVD returned by `precompute_svd`.
+
+    Parameters
+    ----------
+    image_svd : dict
+        The channel-wise SVD of the image, as returned by `precompute_svd`.
     explained_variance : float, optional
         The percentage of variance to retain for each channel. This value must be between 0 and 1. The default 
         value is 0.975 (97.5% variance explained).
     k_components : int, optional
         The number of singular value components to retain for each channel. If provided, `explained_variance` 
         is ignored.
+    store_dtype : np.dtype, optional
+        The datatype in which to store the retained SVD factors: `np.float16`, `np.float32`, or `np.int8` (with a 
+        scale per singular vector). If provided, the factors are returned in the metadata, and the image is 
+        reconstructed from them, so that it reflects the precision of the stored representation.
 
     Returns
     -------
     np.ndarray
-        A 3D NumPy array representing the compressed image with the same shape as the input image but with 
-        reduced rank for each channel.
+        A 3D NumPy array representing the compressed image (height, width, 3), with reduced rank for each channel.
     dict
         A dictionary containing metadata about the compression process, including:
         - `"variance_explained"`: A dictionary mapping each color channel to the percentage of variance explained 
           by the retained singular values.
         - `"num_components"`: A dictionary mapping each color channel to the number of components retained.
-
-    Notes
-    -----
-    - If `k_components` is not provided, the function calculates the minimum number of components required to 
-      explain at least `explained_variance` percent of the total variance for each channel.
-    - If `k_components` is provided, it overrides the `explained_variance` parameter.
+        - `"factors"`: Only if `store_dtype` is provided. A dictionary mapping each color channel to its stored 
+          factors: `"u"`, `"sigma"`, and `"vt"`, and for `np.int8`, `"u_scale"` and `"vt_scale"`. The sum of their 
+          `nbytes` is the size of the compressed representation.
+
+    Raises
+    ------
+    ValueError
+        If `image_svd` was computed with too few components for `explained_variance` or `k_components`, or if 
+        `store_dtype` is not supported.
     """
+    if store_dtype is not None and np.dtype(store_dtype) not in _STORE_DTYPES:
+        raise ValueError(f"store_dtype must be one of float16, float32, or int8, got {np.dtype(store_dtype)}")
 
     # Flag for k_components calculation. 
     k_given = False
     if k_components:
         k_given = True
 
-    # Calculate the channel-wise SVD of the image. 
-    svd = _compute_svd(image)
+    svd, total_variance = image_svd["svd"], image_svd["total_variance"]
+    height, width = svd[0][0].shape[0], svd[0][2].shape[1]
 
-    reconstructed_channels = []
+    reconstructed = np.empty((len(svd), height, width), dtype=np.float32)
     metadata = {
         "variance_explained": dict(),
         "num_components": dict()
     }
+    if store_dtype is not None:
+        metadata["factors"] = dict()
 
-    for color, (u, sigma, vt) in svd.items():
-        cumulative_variance = _get_explained_variance(sigma)
+    for idx, (u, sigma, vt) in enumerate(svd):
+        # A truncated SVD has fewer singular values than the rank of the channel. 
+        truncated = len(sigma) < min(height, width)
 
         # If k_components is not given by user, calculate using explained_variance. 
-        if not k_given:
-            k_components = np.argmax(cumulative_variance >= explained_variance) + 1
-        
-        # Get the top/first 'k' components of sigma
-        sigma_top_k = _get_top_k_singular_values(sigma, k_components)
+        if k_given:
+            if k_components > len(sigma):
+                raise ValueError(f"image_svd has {len(sigma)} components, but k_components is {k_components}")
+            variance = _get_explained_variance(sigma, total_variance[idx], k_components)
+        else:
+            k_components, variance = _get_num_components(sigma, total_variance[idx], explained_variance)
+            if truncated and variance < explained_variance:
+                raise ValueError(
+                    f"image_svd explains {variance:.4f} of the variance, but explained_variance is {explained_variance}"
+                )
+
+        if store_dtype is not None:
+            factors = _quantize_factors(
+                u[:, :k_components], sigma[:k_components], vt[:k_components], np.dtype(store_dtype)
+            )
+            metadata["factors"][_COLORS[idx]] = factors
+            u, sigma, vt = _dequantize_factors(factors)
+
+        _reconstruct_channel(u, sigma, vt, k_components, out=reconstructed[idx])
+
+        metadata["variance_explained"][_COLORS[idx]] = variance
+        metadata["num_components"][_COLORS[idx]] = int(k_components)
+
+    return _clip_to_uint8(reconstructed), metadata
 
-        channel = _reconstruct_channel(u, sigma_top_k, vt) 
-        reconstructed_channels.append(channel)
 
-        metadata["variance_explained"][color] = float(cumulative_variance[k_components - 1])
-        metadata["num_components"][color] = int(k_components)
+def compress_image_using_svd(
+        image: np.ndarray, 
+        explained_variance: float = 0.975, 
+        k_components: int = None, 
+        store_dtype: np.dtype = None, 
+        incremental_threshold: int | None = None
+) -> Tuple[np.ndarray, Dict[str, Dict[str, Union[float, int]]]]:
+    """
+    Compress an image using Singular Value Decomposition (SVD).
 
-    return np.stack(reconstructed_channels, axis=-1), metadata
\ No newline at end of file
+    This function compresses each channel of the input image by retaining the most significant singular values 
+    based on either the explained variance or the specified number of components (`k_components`). The compression 
+    ensures that for each channel, at least `explained_variance` percent of the variance is preserved. If the 
+    `k_components` parameter is provided, the explained variance is ignored, and the number of components is 
+    fixed to `k_components`.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        The input image to compress, represented as a 3D NumPy array (height, width, 3) in RGB format.
+    explained_variance : float, optional
+        The percentage of variance to retain for each channel. This value must be between 0 and 1. The default 
+        value is 0.975 (97.5% variance explained).
+    k_components : int, optional
+        The number of singular value components to retain for each channel. If provided, `explained_variance` 
+        is ignored.
+    store_dtype : np.dtype, optional
+        The datatype in which to store the retained SVD factors: `np.float16`, `np.float32`, or `np.int8` (with a 
+        scale per singular vector). If provided, the factors are returned in the metadata, and the image is 
+        reconstructed from them, so that it reflects the precision of the stored representation.
+    incremental_threshold : int, optional
+        The size in bytes of a channel, in `np.float32`, above which the SVD is computed incrementally over blocks 
+        of rows to bound the peak memory (see `precompute_svd`). By default, the incremental SVD is not used.
+
+    Returns
+    -------
+    np.ndarray
+        A 3D NumPy array representing the compressed image with the same shape as the input image but with 
+        reduced rank for each channel.
+    dict
+        A dictionary containing metadata about the compression process, including:
+        - `"variance_explained"`: A dictionary mapping each color channel to the percentage of variance explained 
+          by the retained singular values.
+        - `"num_components"`: A dictionary mapping each color channel to the number of components retained.
+        - `"factors"`: Only if `store_dtype` is provided. A dictionary mapping each color channel to its stored 
+          factors: `"u"`, `"sigma"`, and `"vt"`, and for `np.int8`, `"u_scale"` and `"vt_scale"`. The sum of their 
+          `nbytes` is the size of the compressed representation.
+
+    Notes
+    -----
+    - If `k_components` is not provided, the function calculates the minimum number of components required to 
+      explain at least `explained_variance` percent of the total variance for each channel.
+    - If `k_components` is provided, it overrides the `explained_variance` parameter.
+    - To compress the same image at several levels, use `precompute_svd` and `reconstruct_from_svd` instead, 
+      so that the SVD is only computed once.
+    """
+    image_svd = precompute_svd(image, explained_variance, k_components, incremental_threshold)
+    return reconstruct_from_svd(image_svd, explained_variance, k_components, store_dtype)
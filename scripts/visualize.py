@@ -1,38 +1,45 @@
+import cv2
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.figure import SubFigure
 from typing import Dict, List, Sequence, Union, Tuple
 
 
 __all__ = ["plot_image", "plot_image_comparison", "plot_compression_metrics"]
 
 
-def _aggregate_metric(compressed: Dict[str, Dict[str, pd.DataFrame]], metric_name: str) -> List[np.ndarray]:
+def _aggregate_metrics(compressed: Dict[str, Dict[str, pd.DataFrame]], metric_names: List[str]) -> List[List[np.ndarray]]:
     """
-    Aggregate the maximum, minimum, and average values of a specific metric across all compression parameters.
+    Aggregate the maximum, minimum, and average values of specific metrics across all compression parameters.
 
-    This function computes the maximum, minimum, and average values of the given metric (e.g., compression ratio, 
-    PSNR, SSIM) for all the compression parameters in the provided `compressed` dictionary.
+    This function computes the maximum, minimum, and average values of each of the given metrics (e.g., compression 
+    ratio, PSNR, SSIM) for all the compression parameters in the provided `compressed` dictionary.
 
     Parameters
     ----------
     compressed : dict
         A dictionary where each key is a compression parameter, and each value is a dictionary containing metrics.
-        The metrics should include the specified `metric_name`.
-    metric_name : str
-        The name of the metric to aggregate (e.g., "compression_ratio", "peak_signal_noise_ratio", "structural_similarity").
+        The metrics should include every name in `metric_names`.
+    metric_names : list of str
+        The names of the metrics to aggregate (e.g., "compression_ratio", "peak_signal_noise_ratio", "structural_similarity").
 
     Returns
     -------
-    list of np.ndarray
-        A list containing three NumPy arrays: max values, min values, and avg values of the specified metric 
-        across the compression parameters.
+    list of list of np.ndarray
+        For each metric in `metric_names`, a list containing three NumPy arrays: max values, min values, and avg 
+        values of the metric across the compression parameters.
+
+    Notes
+    -----
+    Every parameter is expected to have metrics for the same number of images. The metrics are stacked once, into 
+    an array of shape (number of parameters, number of images, number of metrics), and each statistic is computed 
+    for all metrics in a single reduction along the images.
     """
-    metric_max = [compressed[param]["metrics"][metric_name].max() for param in compressed.keys()]
-    metric_min = [compressed[param]["metrics"][metric_name].min() for param in compressed.keys()]
-    metric_avg = [compressed[param]["metrics"][metric_name].mean() for param in compressed.keys()]
+    values = np.stack([compressed[param]["metrics"][metric_names].to_numpy(dtype=np.float64) for param in compressed.keys()])
+    max_values, min_values, avg_values = values.max(axis=1), values.min(axis=1), values.mean(axis=1)
 
-    return [metric_max, metric_min, metric_avg]
+    return [[max_values[:, idx], min_values[:, idx], avg_values[:, idx]] for idx in range(len(metric_names))]
 
 
 def _plot_metric(x: np.ndarray, metric: List[np.ndarray], ax: plt.Axes, title: str, xlabel: str) -> None:
@@ -106,30 +113,23 @@ def plot_compression_metrics(compressed: Dict[str, Dict], param_set: Sequence[Un
     true_cr = "True Compression Ratio"
     psnr = "Peak Signal to Noise Ratio"
     ssim = "Structural Similarity"
-    metrics = {
-        true_cr: _aggregate_metric(compressed, "compression_ratio"), 
-        psnr: _aggregate_metric(compressed, "peak_signal_noise_ratio"), 
-        ssim: _aggregate_metric(compressed, "structural_similarity")
-    }
+    metrics = dict(zip(
+        [true_cr, psnr, ssim], 
+        _aggregate_metrics(compressed, ["compression_ratio", "peak_signal_noise_ratio", "structural_similarity"])
+    ))
 
     fig, axes = plt.subplots(1, 3, figsize=(15, 5))
     fig.suptitle(suptitle)
     line_alpha = 0.65
     fill_alpha = 0.15
-    axes[0].axhline(1, c="k", ls="--", alpha=line_alpha)
-    fill_upper_limit = 1
-    fill_lower_limit = min(min(metrics[true_cr][1]), fill_upper_limit)
-    axes[0].fill_between(param_set, [fill_upper_limit] * len(param_set), [fill_lower_limit] * len(param_set), alpha=fill_alpha, color="black")
-
-    axes[1].axhline(20, c="k", ls="--", alpha=line_alpha)
-    fill_upper_limit = 20
-    fill_lower_limit = min(min(metrics[psnr][1]), fill_upper_limit)
-    axes[1].fill_between(param_set, [fill_upper_limit] * len(param_set), [fill_lower_limit] * len(param_set), alpha=fill_alpha, color="black")
-
-    axes[2].axhline(0.7, c="k", ls="--", alpha=line_alpha)
-    fill_upper_limit = 0.7
-    fill_lower_limit = min(min(metrics[ssim][1]), fill_upper_limit)
-    axes[2].fill_between(param_set, [0.7] * len(param_set), [fill_lower_limit] * len(param_set), alpha=fill_alpha, color="black")
+
+    # Shade the region below the acceptable threshold of each metric, down to its lowest value. 
+    thresholds = {true_cr: 1, psnr: 20, ssim: 0.7}
+    for ax, (title, threshold) in zip(axes, thresholds.items()):
+        ax.axhline(threshold, c="k", ls="--", alpha=line_alpha)
+        fill_lower_limit = min(metrics[title][1].min(), threshold)
+        ax.fill_between(param_set, threshold, fill_lower_limit, alpha=fill_alpha, color="black")
+
     for idx, (title, metric) in enumerate(metrics.items()):
         ax = axes[idx]
         _plot_metric(param_set, metric, ax, title, xlabel)
@@ -180,7 +180,13 @@ def plot_image(img: np.ndarray, ax: plt.Axes, title: str, label: str = None) ->
         ax.set_axis_off()
 
 
-def _plot_image_comparison_helper(original_image: np.ndarray, compressed_image: np.ndarray, title: str = None, stats: str = None) -> None:
+def _plot_image_comparison_helper(
+        fig: Union[plt.Figure, SubFigure], 
+        original_image: np.ndarray, 
+        compressed_image: np.ndarray, 
+        title: str = None, 
+        stats: str = None
+) -> None:
     """
     Helper function to plot a comparison between the original and compressed images.
 
@@ -189,6 +195,8 @@ def _plot_image_comparison_helper(original_image: np.ndarray, compressed_image:
 
     Parameters
     ----------
+    fig : matplotlib.figure.Figure or matplotlib.figure.SubFigure
+        The figure, or subfigure, to draw the panels in.
     original_image : np.ndarray
         The original image to display.
     compressed_image : np.ndarray
@@ -204,27 +212,38 @@ def _plot_image_comparison_helper(original_image: np.ndarray, compressed_image:
 
     Notes
     -----
-    The function assumes that `original_image` and `compressed_image` are 3D numpy arrays.
+    The function assumes that `original_image` and `compressed_image` are 3D numpy arrays of the same shape and dtype.
     """
 
     ncols = 3
     if not stats is None:
         ncols = 4
     
-    fig, axes = plt.subplots(1, ncols, figsize=(17, 5))
+    axes = fig.subplots(1, ncols)
     if title:
         fig.suptitle(title)
-        fig.subplots_adjust(top=0.85)
 
     plot_image(original_image, axes[0], "Original Image")
     plot_image(compressed_image, axes[1], "Compressed Image")
-    plot_image(original_image - compressed_image, axes[2], "Appoximation Error")
+    # Subtracting uint8 arrays wraps around, so the saturating absolute difference is used instead. 
+    plot_image(cv2.absdiff(original_image, compressed_image), axes[2], "Appoximation Error")
 
     if not stats is None:
-        plot_image(np.ones_like(original_image) * 255, axes[3], "Statistics", label=str(stats))
-
-    fig.tight_layout()
-    fig.set_constrained_layout(True)
+        # The statistics are drawn as text on blank axes, without a background image the size of the original. 
+        axes[3].set_axis_off()
+        axes[3].set_box_aspect(original_image.shape[0] / original_image.shape[1])
+        axes[3].set_title("Statistics")
+        axes[3].text(
+            0.5, 
+            0.5, 
+            str(stats), 
+            transform=axes[3].transAxes, 
+            ha="center", 
+            va="center", 
+            multialignment="left", 
+            bbox=dict(boxstyle="round", fc="0.9"), 
+            family="monospace"
+        )
 
 
 def plot_image_comparison(imgs: List[np.ndarray], compressed: Dict[str, Dict], param_name: str, idx: int, step: int = None) -> None:
@@ -260,7 +279,8 @@ def plot_image_comparison(imgs: List[np.ndarray], compressed: Dict[str, Dict], p
     -----
     - For each parameter in `compressed`, the original and compressed images, along with their differences, are plotted.
     - If compression statistics are available, they are displayed on the last plot.
-    - The function creates subplots and adjusts the layout for better visualization.
+    - All parameters are drawn in a single figure, with one subfigure per parameter, instead of creating a figure 
+      for each parameter. The figure uses the constrained layout.
     """
 
     original_img = imgs[idx]
@@ -270,9 +290,14 @@ def plot_image_comparison(imgs: List[np.ndarray], compressed: Dict[str, Dict], p
     if not step:
         step = 1
 
-    for i in range(0, len(compressed_imgs), step):
+    plot_idxs = range(0, len(compressed_imgs), step)
+    fig = plt.figure(figsize=(17, 5 * len(plot_idxs)), layout="constrained")
+    subfigs = fig.subfigures(len(plot_idxs), 1, squeeze=False)[:, 0]
+
+    for subfig, i in zip(subfigs, plot_idxs):
         stats = compressed[param_set[i]]["metrics"].loc[idx].to_string()
         _plot_image_comparison_helper(
+            subfig, 
             original_img, 
             compressed_imgs[i], 
             f"{param_name} {param_set[i]}", 